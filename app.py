@@ -1,12 +1,14 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import PyPDF2
 import json
-from typing import Dict, Any, List, Optional 
+from typing import Dict, Any, List, Optional, Tuple 
 from qa_system import ResumeQASystem
 from utils import groq_generate 
 import streamlit.components.v1 as components
 import tempfile
+import os
 import smtplib
 from email.message import EmailMessage
 import re
@@ -330,6 +332,118 @@ def evaluate_resume_for_job(resume_text: str, job_req_text: str, threshold: floa
         return True
     return False
 
+def embed_texts(texts: List[str], qa_system: ResumeQASystem) -> np.ndarray:
+    """
+    Embed each text once into a single L2-normalised vector.
+    Texts are split into chunks so long resumes are not truncated by the model; all chunks
+    are embedded in one batch and mean-pooled back into one vector per text.
+    Empty or whitespace-only texts are not embedded and keep a zero vector, so they score 0.
+    """
+    owners, chunks = [], []
+    for idx, text in enumerate(texts):
+        if not text.strip():
+            continue
+        text_chunks = qa_system.text_splitter.split_text(text) or [text]
+        owners.extend([idx] * len(text_chunks))
+        chunks.extend(text_chunks)
+
+    if not chunks:
+        return np.zeros((len(texts), 1), dtype=np.float32)
+
+    chunk_vectors = np.asarray(qa_system.embeddings.embed_documents(chunks), dtype=np.float32)
+    vectors = np.zeros((len(texts), chunk_vectors.shape[1]), dtype=np.float32)
+    np.add.at(vectors, np.asarray(owners), chunk_vectors)
+    vectors /= np.maximum(np.bincount(owners, minlength=len(texts)), 1)[:, None]
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+def compute_score_matrix(job_texts: List[str], resume_texts: List[str], qa_system: ResumeQASystem) -> np.ndarray:
+    """
+    Score every resume against every job description in a single vectorized pass.
+    Returns an N x M matrix of cosine similarities (rows are jobs, columns are resumes).
+    """
+    job_vectors = embed_texts(job_texts, qa_system)
+    resume_vectors = embed_texts(resume_texts, qa_system)
+    if job_vectors.shape[1] != resume_vectors.shape[1]:
+        # One side had no text at all, so nothing can match.
+        return np.zeros((len(job_texts), len(resume_texts)), dtype=np.float32)
+    return job_vectors @ resume_vectors.T
+
+def build_candidate_row(filename: str, resume_text: str) -> Dict[str, str]:
+    """Extract the candidate details written to the screening Excel file."""
+    parsed_data = extract_info(resume_text)
+    basic_info = parsed_data.get("Basic Info", {})
+    name = basic_info.get("Name", "").strip() or "NA"
+    email = basic_info.get("Email", "").strip() or "NA"
+    contact = basic_info.get("Phone", "").strip() or "NA"
+    linkedin = extract_linkedin(resume_text).strip() or "NA"
+    return {
+        "Filename": filename.strip() if filename and filename.strip() else "NA",
+        "Name": name,
+        "Contact": contact,
+        "Email": email,
+        "LinkedIn": linkedin
+    }
+
+def autofit_columns(ws) -> None:
+    """Auto-adjust column widths of an openpyxl worksheet to fit its contents."""
+    from openpyxl.utils import get_column_letter#type:ignore
+    for i, col in enumerate(ws.columns, start=1):
+        max_length = 0
+        col_letter = get_column_letter(i)
+        for cell in col:
+            if cell.value:
+                max_length = max(max_length, len(str(cell.value)))
+        ws.column_dimensions[col_letter].width = max_length + 2
+
+def build_score_table(scores: np.ndarray, job_labels: List[str], resume_names: List[str]) -> pd.DataFrame:
+    """
+    Lay out the job x resume score matrix for display, one row per resume.
+    Rows are numbered so resumes sharing a filename still get unique labels.
+    """
+    index = [f"{i + 1}. {name}" for i, name in enumerate(resume_names)]
+    return pd.DataFrame(scores.T, index=index, columns=job_labels)
+
+def shortlist_mask(scores: np.ndarray, threshold: float, has_text: np.ndarray,
+                   job_has_text: np.ndarray) -> np.ndarray:
+    """Mark the job x resume pairs scoring at least `threshold`, skipping resumes and jobs with no text."""
+    return (scores >= threshold) & has_text & job_has_text[:, None]
+
+def build_shortlists(scores: np.ndarray, threshold: float, has_text: np.ndarray,
+                     job_has_text: np.ndarray, job_titles: List[str], sheet_names: List[str],
+                     resume_names: List[str], resume_texts: List[str],
+                     candidates: Dict[int, Dict[str, str]]) -> List[Tuple[str, str, List[Dict[str, Any]]]]:
+    """
+    Build one shortlist per role from the job x resume score matrix.
+    Resumes scoring at least `threshold` are listed by descending Match Score. Candidate details
+    are extracted once per resume and stored in `candidates`, however many roles it is shortlisted for.
+    Returns (sheet_name, job_title, rows) for every role.
+    """
+    shortlisted = shortlist_mask(scores, threshold, has_text, job_has_text)
+    sheets = []
+    for job_idx, (sheet_name, title) in enumerate(zip(sheet_names, job_titles)):
+        resume_idxs = np.flatnonzero(shortlisted[job_idx])
+        resume_idxs = resume_idxs[np.argsort(-scores[job_idx, resume_idxs], kind="stable")]
+        rows = []
+        for resume_idx in resume_idxs.tolist():
+            if resume_idx not in candidates:
+                candidates[resume_idx] = build_candidate_row(resume_names[resume_idx], resume_texts[resume_idx])
+            rows.append({**candidates[resume_idx], "Match Score": round(float(scores[job_idx, resume_idx]), 3)})
+        sheets.append((sheet_name, title, rows))
+    return sheets
+
+def make_sheet_name(title: str, used: set) -> str:
+    """Turn a job title into a unique, valid Excel sheet name (max 31 characters)."""
+    base = re.sub(r'[\[\]:*?/\\]', '_', title).strip("' ") or "Job"
+    name = base[:31].strip("' ")
+    suffix = 2
+    while name.lower() in used:
+        tag = f" ({suffix})"
+        name = base[:31 - len(tag)].strip("' ") + tag
+        suffix += 1
+    used.add(name.lower())
+    return name
+
 def send_email(file_path: str, sender_email: str, sender_password: str, recipient_email: str):
     """Send the provided Excel file via email to the HR representative."""
     msg = EmailMessage()
@@ -349,6 +463,22 @@ def send_email(file_path: str, sender_email: str, sender_password: str, recipien
         smtp.login(sender_email, sender_password)
         smtp.send_message(msg)
 
+def display_email_form(excel_path: str):
+    """Render the form used to email a generated Excel file to HR."""
+    st.subheader("Email Excel to HR")
+    sender_email = st.text_input("Sender Email", key="sender_email")
+    sender_password = st.text_input("Sender Email Password", type="password", key="sender_password")
+    recipient_email = st.text_input("HR Email Address", key="recipient_email")
+    if st.button("Send Email to HR"):
+        if sender_email and sender_password and recipient_email:
+            try:
+                send_email(excel_path, sender_email, sender_password, recipient_email)
+                st.success("Email sent successfully!")
+            except Exception as e:
+                st.error(f"Failed to send email: {e}")
+        else:
+            st.warning("Please provide all email details to proceed.")
+
 # ----------------------------------------------
 # Main Application
 # ----------------------------------------------
@@ -356,7 +486,7 @@ def send_email(file_path: str, sender_email: str, sender_password: str, recipien
 st.set_page_config(page_title="📄Skilltrack", layout="wide")
 
 def main():
-    mode = st.sidebar.selectbox("Select Mode", ["Individual Analysis", "Resume Screening"])
+    mode = st.sidebar.selectbox("Select Mode", ["Individual Analysis", "Resume Screening", "Multi-Job Screening"])
     
     if mode == "Individual Analysis":
         if "qa_system" not in st.session_state:
@@ -428,7 +558,7 @@ def main():
             else:
                 st.warning("⚠️ Please upload a resume first.")
     
-    else:
+    elif mode == "Resume Screening":
         st.header("📄Skilltrack-AI Resume Screening")
         st.sidebar.header("📂 Resume Screening")
         uploaded_resumes = st.sidebar.file_uploader("Upload Resumes (PDF or TXT)", type=["pdf", "txt"],
@@ -444,19 +574,7 @@ def main():
             for file in uploaded_resumes:
                 resume_text = read_resume(file)
                 if evaluate_resume_for_job(resume_text, job_req_text):
-                    parsed_data = extract_info(resume_text)
-                    basic_info = parsed_data.get("Basic Info", {})
-                    name = basic_info.get("Name", "").strip() or "NA"
-                    email = basic_info.get("Email", "").strip() or "NA"
-                    contact = basic_info.get("Phone", "").strip() or "NA"
-                    linkedin = extract_linkedin(resume_text).strip() or "NA"
-                    selected_resumes.append({
-                        "Filename": file.name.strip() if file.name and file.name.strip() else "NA",
-                        "Name": name,
-                        "Contact": contact,
-                        "Email": email,
-                        "LinkedIn": linkedin
-                    })
+                    selected_resumes.append(build_candidate_row(file.name, resume_text))
 
             st.write(f"**Selected Resumes:** {len(selected_resumes)} out of {len(uploaded_resumes)}")
 
@@ -468,16 +586,8 @@ def main():
                 
                 # Auto-adjust column widths in the generated Excel file using openpyxl.
                 import openpyxl #type:ignore
-                from openpyxl.utils import get_column_letter#type:ignore
                 wb = openpyxl.load_workbook(excel_path)
-                ws = wb.active
-                for i, col in enumerate(ws.columns, start=1):
-                    max_length = 0
-                    col_letter = get_column_letter(i)
-                    for cell in col:
-                        if cell.value:
-                            max_length = max(max_length, len(str(cell.value)))
-                    ws.column_dimensions[col_letter].width = max_length + 2
+                autofit_columns(wb.active)
                 wb.save(excel_path)
 
                 with open(excel_path, "rb") as f:
@@ -488,23 +598,116 @@ def main():
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
                 
-                st.subheader("Email Excel to HR")
-                sender_email = st.text_input("Sender Email", key="sender_email")
-                sender_password = st.text_input("Sender Email Password", type="password", key="sender_password")
-                recipient_email = st.text_input("HR Email Address", key="recipient_email")
-                if st.button("Send Email to HR"):
-                    if sender_email and sender_password and recipient_email:
-                        try:
-                            send_email(excel_path, sender_email, sender_password, recipient_email)
-                            st.success("Email sent successfully!")
-                        except Exception as e:
-                            st.error(f"Failed to send email: {e}")
-                    else:
-                        st.warning("Please provide all email details to proceed.")
+                display_email_form(excel_path)
             else:
                 st.warning("No resumes match the job requirements. Please adjust your criteria or check the uploads.")
         else:
             st.info("Please upload both resumes and a job requirements file to proceed.")
 
+    else:
+        st.header("📄Skilltrack-AI Multi-Job Screening")
+        st.sidebar.header("📂 Multi-Job Screening")
+        uploaded_resumes = st.sidebar.file_uploader("Upload Resumes (PDF or TXT)", type=["pdf", "txt"],
+                                                    accept_multiple_files=True, key="multi_resumes")
+        job_req_files = st.sidebar.file_uploader("Upload Job Requirements Files (PDF or TXT)", type=["pdf", "txt"],
+                                                 accept_multiple_files=True, key="multi_job_requirements")
+        # With all-MiniLM-L6-v2, unrelated documents typically score below ~0.3 and a resume and job
+        # description from the same field above ~0.5, so 0.5 keeps on-topic candidates; the score
+        # matrix is shown so recruiters can tune it for their pool.
+        threshold = st.sidebar.slider(
+            "Minimum Match Score", min_value=0.0, max_value=1.0, value=0.5, step=0.05, key="multi_threshold",
+            help="Semantic similarity (cosine) between the resume and job description embeddings, not the "
+                 "keyword coverage used by Resume Screening mode. Scores are not comparable between the two modes."
+        )
+
+        if uploaded_resumes and job_req_files:
+            if "qa_system" not in st.session_state:
+                st.session_state.qa_system = ResumeQASystem()
+
+            # Each resume and job description is read and embedded once; the result is kept across
+            # reruns so adjusting the threshold or filling in the email form does not redo the work.
+            upload_key = (tuple(f.file_id for f in uploaded_resumes),
+                          tuple(f.file_id for f in job_req_files))
+            if st.session_state.get("multi_job_key") != upload_key:
+                with st.spinner("🔍 Scoring resumes against all roles..."):
+                    resume_texts = [read_resume(file) for file in uploaded_resumes]
+                    job_texts = [read_resume(file) for file in job_req_files]
+                    st.session_state.multi_job_scores = compute_score_matrix(
+                        job_texts, resume_texts, st.session_state.qa_system)
+                st.session_state.multi_job_resume_texts = resume_texts
+                st.session_state.multi_job_job_has_text = np.array([bool(text.strip()) for text in job_texts])
+                st.session_state.multi_job_candidates = {}
+                st.session_state.multi_job_key = upload_key
+
+            scores = st.session_state.multi_job_scores
+            resume_texts = st.session_state.multi_job_resume_texts
+            candidates = st.session_state.multi_job_candidates
+            job_titles = [file.name.rsplit(".", 1)[0] for file in job_req_files]
+            resume_names = [file.name for file in uploaded_resumes]
+            used_sheet_names = set()
+            sheet_names = [make_sheet_name(title, used_sheet_names) for title in job_titles]
+            st.info(f"Scored {len(resume_names)} resumes against {len(job_titles)} job requirements files.")
+            empty_resumes = [name for name, text in zip(resume_names, resume_texts) if not text.strip()]
+            if empty_resumes:
+                st.warning(f"No text could be extracted from: {', '.join(empty_resumes)}. "
+                           "These resumes score 0 and are not shortlisted.")
+            job_has_text = st.session_state.multi_job_job_has_text
+            empty_jobs = [file.name for file, ok in zip(job_req_files, job_has_text) if not ok]
+            if empty_jobs:
+                st.warning(f"No text could be extracted from: {', '.join(empty_jobs)}. "
+                           "These roles score 0 and get no shortlist.")
+
+            st.subheader("Score Matrix")
+            st.dataframe(build_score_table(scores, sheet_names, resume_names).style.format("{:.2f}"))
+
+            has_text = np.array([bool(text.strip()) for text in resume_texts])
+            shortlisted = shortlist_mask(scores, threshold, has_text, job_has_text)
+            st.write(f"**Resumes shortlisted for at least one role:** "
+                     f"{int(shortlisted.any(axis=0).sum())} out of {len(resume_names)}")
+            sheets = build_shortlists(scores, threshold, has_text, job_has_text, job_titles, sheet_names,
+                                      resume_names, resume_texts, candidates)
+
+            for _, title, rows in sheets:
+                with st.expander(f"{title}: {len(rows)} shortlisted"):
+                    if rows:
+                        st.dataframe(pd.DataFrame(rows))
+                    else:
+                        st.write("No resumes match this role.")
+
+            if any(rows for _, _, rows in sheets):
+                # The workbook is only rebuilt when the uploads or threshold change, and the previous
+                # temp file is removed, so reruns from the email form do not pile up files.
+                workbook_key = (upload_key, threshold)
+                if st.session_state.get("multi_job_workbook_key") != workbook_key:
+                    old_path = st.session_state.get("multi_job_workbook_path")
+                    if old_path and os.path.exists(old_path):
+                        os.remove(old_path)
+                    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
+                        excel_path = tmp.name
+                    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+                        for sheet_name, _, rows in sheets:
+                            df = pd.DataFrame(rows, columns=["Filename", "Name", "Contact", "Email", "LinkedIn", "Match Score"])
+                            df.to_excel(writer, sheet_name=sheet_name, index=False)
+                        for ws in writer.book.worksheets:
+                            autofit_columns(ws)
+                    with open(excel_path, "rb") as f:
+                        st.session_state.multi_job_workbook_bytes = f.read()
+                    st.session_state.multi_job_workbook_path = excel_path
+                    st.session_state.multi_job_workbook_key = workbook_key
+                excel_path = st.session_state.multi_job_workbook_path
+
+                st.download_button(
+                    label="Download Shortlists Excel",
+                    data=st.session_state.multi_job_workbook_bytes,
+                    file_name="shortlisted_resumes_by_role.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+
+                display_email_form(excel_path)
+            else:
+                st.warning("No resumes match any of the job requirements. Please lower the threshold or check the uploads.")
+        else:
+            st.info("Please upload resumes and at least one job requirements file to proceed.")
+
 if __name__ == "__main__":
     main()
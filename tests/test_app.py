@@ -0,0 +1,115 @@
+import numpy as np
+import streamlit as st
+
+import app
+from app import build_score_table, build_shortlists, compute_score_matrix, make_sheet_name
+
+
+def test_score_table_renders_with_duplicate_resume_filenames():
+    scores = np.array([[0.9, 0.4, 0.7], [0.1, 0.8, 0.3]], dtype=np.float32)
+    table = build_score_table(scores, ["Data Scientist", "Backend Engineer"],
+                              ["resume.pdf", "resume.pdf", "cv.txt"])
+
+    assert table.shape == (3, 2)
+    assert table.index.is_unique
+    assert list(table.index) == ["1. resume.pdf", "2. resume.pdf", "3. cv.txt"]
+    # Raised "Duplicate column names found" when filenames were used as labels.
+    st.dataframe(table.style.format("{:.2f}"))
+
+
+def test_sheet_name_does_not_end_with_apostrophe_after_truncation():
+    used = set()
+    name = make_sheet_name("x" * 30 + "'y", used)
+
+    assert name == "x" * 30
+    assert make_sheet_name("x" * 30 + "'y", used) == "x" * 27 + " (2)"
+
+
+class _FakeSplitter:
+    def split_text(self, text):
+        return [text[i:i + 20] for i in range(0, len(text), 20)]
+
+
+class _FakeEmbeddings:
+    def embed_documents(self, texts):
+        return [[text.count("python") + 1.0, text.count("java") + 1.0] for text in texts]
+
+
+class _FakeQASystem:
+    text_splitter = _FakeSplitter()
+    embeddings = _FakeEmbeddings()
+
+
+def test_empty_resume_scores_zero_against_every_role():
+    scores = compute_score_matrix(["python developer", "java developer"],
+                                  ["python python", "", "   \n"], _FakeQASystem())
+
+    assert scores.shape == (2, 3)
+    assert (scores[:, 0] > 0).all()
+    assert (scores[:, 1:] == 0).all()
+
+
+def _stub_candidate_rows(monkeypatch):
+    calls = []
+
+    def fake_build_candidate_row(filename, resume_text):
+        calls.append(filename)
+        return {"Filename": filename, "Name": resume_text, "Contact": "NA", "Email": "NA", "LinkedIn": "NA"}
+
+    monkeypatch.setattr(app, "build_candidate_row", fake_build_candidate_row)
+    return calls
+
+
+def test_shortlists_are_ordered_by_descending_match_score(monkeypatch):
+    _stub_candidate_rows(monkeypatch)
+    scores = np.array([[0.6, 0.9, 0.7]], dtype=np.float32)
+
+    sheets = build_shortlists(scores, 0.5, np.array([True, True, True]), np.array([True]),
+                              ["Data Scientist"], ["Data Scientist"], ["a.pdf", "b.pdf", "c.pdf"], ["A", "B", "C"], {})
+
+    sheet_name, title, rows = sheets[0]
+    assert (sheet_name, title) == ("Data Scientist", "Data Scientist")
+    assert [row["Filename"] for row in rows] == ["b.pdf", "c.pdf", "a.pdf"]
+    assert [row["Match Score"] for row in rows] == [0.9, 0.7, 0.6]
+
+
+def test_shortlists_include_scores_equal_to_threshold(monkeypatch):
+    _stub_candidate_rows(monkeypatch)
+    scores = np.array([[0.5, 0.49]])
+
+    sheets = build_shortlists(scores, 0.5, np.array([True, True]), np.array([True]), ["Role"], ["Role"],
+                              ["a.pdf", "b.pdf"], ["A", "B"], {})
+
+    assert [row["Filename"] for row in sheets[0][2]] == ["a.pdf"]
+
+
+def test_candidate_details_extracted_once_per_resume_across_roles(monkeypatch):
+    calls = _stub_candidate_rows(monkeypatch)
+    scores = np.array([[0.9, 0.8], [0.7, 0.1], [0.6, 0.95]])
+    candidates = {}
+
+    roles = ["R1", "R2", "R3"]
+    sheets = build_shortlists(scores, 0.5, np.array([True, True]), np.array([True, True, True]), roles, roles,
+                              ["a.pdf", "b.pdf"], ["A", "B"], candidates)
+    # A rerun with a lower threshold reuses the rows already extracted.
+    build_shortlists(scores, 0.0, np.array([True, True]), np.array([True, True, True]), roles, roles,
+                     ["a.pdf", "b.pdf"], ["A", "B"], candidates)
+
+    assert [len(rows) for _, _, rows in sheets] == [2, 1, 2]
+    assert sorted(calls) == ["a.pdf", "b.pdf"]
+
+
+def test_empty_job_description_gets_no_shortlist_at_zero_threshold(monkeypatch):
+    calls = _stub_candidate_rows(monkeypatch)
+    job_texts = ["python developer", ""]
+    resume_texts = ["python python", "java"]
+    scores = compute_score_matrix(job_texts, resume_texts, _FakeQASystem())
+    job_has_text = np.array([bool(text.strip()) for text in job_texts])
+
+    sheets = build_shortlists(scores, 0.0, np.array([True, True]), job_has_text, ["Python", "Scanned"],
+                              ["Python", "Scanned"], ["a.pdf", "b.pdf"], resume_texts, {})
+
+    assert (scores[1] == 0).all()
+    assert len(sheets[0][2]) == 2
+    assert sheets[1][2] == []
+    assert sorted(calls) == ["a.pdf", "b.pdf"]